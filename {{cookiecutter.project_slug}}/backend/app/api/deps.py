@@ -1,14 +1,18 @@
+import hashlib
 from collections.abc import Generator
 from typing import Annotated
 
-import jwt
-from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
-from pydantic import ValidationError
+from pydantic import EmailStr, ValidationError
 from sqlmodel import Session
 
 from app.core import security
+from app.core.cache import TTLCache
+from app.core.rate_limit import RateLimiter, login_rate_limiter, password_reset_rate_limiter
+from app.core.principal import Principal, cache_principal, principal_cache
+from app.core.revocation import revocation_list
 from app.core.config import settings
 from app.core.db import engine
 from app.models import TokenPayload, User
@@ -27,25 +31,70 @@ def get_db() -> Generator[Session, None, None]:
 SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
+# Verified token payloads keyed by a digest of the token, expiring at the token's exp
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE)
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:  # type: ignore
-    """Get the current user from the token."""
+
+def decode_token(token: str) -> TokenPayload:
+    """Decode and validate an access token, reusing previously verified payloads."""
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(key)
+    if token_data is not None:
+        return token_data
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
+        payload = security.decode_access_token(token)
         token_data = TokenPayload(**payload)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=403,
             detail="Could not validate credentials",
         )
+    if "exp" in payload:
+        token_cache.set(key, token_data, expires_at=payload["exp"])
+    return token_data
+
+
+def decode_user_token(token: str) -> TokenPayload:
+    """Decode an access token, rejecting tokens issued to clients."""
+    token_data = decode_token(token)
+    if token_data.client_id is not None:
+        raise HTTPException(
+            status_code=403,
+            detail="Could not validate credentials",
+        )
+    return token_data
+
+
+def check_token_version(token_data: TokenPayload, token_version: int) -> None:
+    """Reject self-contained tokens issued before the user's last token_version bump."""
+    if token_data.token_version is not None and token_data.token_version != token_version:
+        raise HTTPException(
+            status_code=403,
+            detail="Token has been revoked",
+        )
+
+
+def check_token_not_revoked(session: Session, token_data: TokenPayload) -> None:
+    """Reject tokens whose jti is in the revocation list."""
+    if token_data.jti and revocation_list.is_revoked(session, token_data.jti):
+        raise HTTPException(
+            status_code=403,
+            detail="Token has been revoked",
+        )
+
+
+def get_current_user(session: SessionDep, token: TokenDep) -> User:  # type: ignore
+    """Get the current user from the token."""
+    token_data = decode_user_token(token)
+    check_token_not_revoked(session, token_data)
     user = session.get(User, token_data.sub)
     if not user:
         raise HTTPException(
             status_code=404,
             detail="User not found",
         )
+    cache_principal(user)
+    check_token_version(token_data, user.token_version)
     if not user.is_active:
         raise HTTPException(
             status_code=400,
@@ -57,11 +106,66 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:  # type: ign
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
+def get_current_principal(session: SessionDep, token: TokenDep) -> Principal:  # type: ignore
+    """Get the identity of the current user, from the principal cache when possible."""
+    token_data = decode_user_token(token)
+    check_token_not_revoked(session, token_data)
+    principal = principal_cache.get(token_data.sub)
+    if principal is None:
+        user = session.get(User, token_data.sub)
+        if not user:
+            raise HTTPException(
+                status_code=404,
+                detail="User not found",
+            )
+        principal = cache_principal(user)
+    check_token_version(token_data, principal.token_version)
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=400,
+            detail="Inactive user",
+        )
+    return principal
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+def get_current_active_superuser(session: SessionDep, token: TokenDep) -> Principal:  # type: ignore
     """Get the current active superuser."""
-    if not current_user.is_superuser:
+    # Self-contained tokens let non-superusers be rejected without any lookup
+    token_data = decode_user_token(token)
+    if token_data.ver is None or token_data.is_superuser:
+        current_user = get_current_principal(session, token)
+        if current_user.is_superuser:
+            return current_user
+    raise HTTPException(
+        status_code=403,
+        detail="The user doesn't have enough privileges",
+    )
+
+
+def _enforce_rate_limit(rate_limiter: RateLimiter, request: Request, email: str) -> None:
+    retry_after = rate_limiter.hit(
+        ip=request.client.host if request.client else None,
+        email=email.strip().lower(),
+    )
+    if retry_after is not None:
         raise HTTPException(
-            status_code=403,
-            detail="The user doesn't have enough privileges",
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(retry_after)},
         )
-    return current_user
+
+
+def limit_login_attempts(
+    request: Request,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+) -> None:
+    """Throttle login attempts per client IP and per submitted email."""
+    _enforce_rate_limit(login_rate_limiter, request, form_data.username)
+
+
+def limit_password_reset_requests(request: Request, email: EmailStr) -> None:
+    """Throttle password reset requests per client IP and per submitted email."""
+    _enforce_rate_limit(password_reset_rate_limiter, request, email)
@@ -2,10 +2,13 @@ from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from app.core.admission import OverloadedError
+
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=getattr(exc, "headers", None),
     )
 
 async def validation_exception_handler(request: Request, exc: ValidationError):
@@ -13,3 +16,10 @@ async def validation_exception_handler(request: Request, exc: ValidationError):
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors()},
     )
+
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is busy, try again later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import users, login, password_reset, clients, google_auth
+from app.api.routes import users, login, password_reset, clients, google_auth, metrics
 
 
 api_router = APIRouter()
@@ -9,4 +9,5 @@ api_router.include_router(users.router)
 api_router.include_router(login.router)
 api_router.include_router(password_reset.router)
 api_router.include_router(clients.router)
-api_router.include_router(google_auth.router)
\ No newline at end of file
+api_router.include_router(google_auth.router)
+api_router.include_router(metrics.router)
\ No newline at end of file
@@ -1 +1 @@
-from . import users, login, password_reset, clients, google_auth
\ No newline at end of file
+from . import users, login, password_reset, clients, google_auth, metrics, well_known
\ No newline at end of file
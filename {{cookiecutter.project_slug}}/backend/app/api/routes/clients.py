@@ -6,6 +6,7 @@ from pydantic import ValidationError
 from pydantic import ValidationError
 from sqlmodel import Session
 
+from app.core.principal import Principal
 from app.crud import client as crud_client
 from app.api.deps import SessionDep, get_current_active_superuser
 from app.models import Client, ClientCreate, ClientPublic, ClientUpdate, Message, ClientCreateResponse
@@ -15,14 +16,14 @@ router = APIRouter(prefix="/clients", tags=["clients"])
 
 from app.services.client_service import ClientService
 
-def get_client_service(session: Session = Depends(SessionDep)) -> ClientService:
+def get_client_service(session: SessionDep) -> ClientService:
     return ClientService(session)
 
 @router.post("/", response_model=ClientCreateResponse)
 def create_client(
     client_in: ClientCreate = Body(...),
     client_service: ClientService = Depends(get_client_service),
-    current_user: Client = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Create new client.
@@ -34,7 +35,7 @@ def create_client(
 def read_client(
     client_id: UUID,
     session: SessionDep,
-    current_user: Client = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Get client by ID.
@@ -46,34 +47,32 @@ def read_client(
 def update_client(
     client_id: UUID,
     client_in: ClientUpdate,
-    session: SessionDep,
-    current_user: Client = Depends(get_current_active_superuser),
+    client_service: ClientService = Depends(get_client_service),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Update a client.
     """
-    client = crud_client.get_client_by_client_id(session=session, client_id=client_id)
-    return crud_client.update_client(session=session, db_client=client, client_in=client_in)
+    return client_service.update_client(client_id=client_id, client_in=client_in)
 
 
 @router.delete("/{client_id}", response_model=Message)
 def delete_client(
     client_id: UUID,
-    session: SessionDep,
-    current_user: Client = Depends(get_current_active_superuser),
+    client_service: ClientService = Depends(get_client_service),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Delete a client.
     """
-    client = crud_client.get_client_by_client_id(session=session, client_id=client_id)
-    crud_client.delete_client(session=session, db_client=client)
+    client_service.delete_client(client_id=client_id)
     return {"message": "Client deleted successfully"}
 
 
 @router.get("/", response_model=dict[str, Any])
 def read_clients(
     session: SessionDep,
-    current_user: Client = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
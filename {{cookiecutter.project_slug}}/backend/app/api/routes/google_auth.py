@@ -3,7 +3,6 @@ from typing import Any
 import jwt
 import httpx
 import uuid # Added this import
-from datetime import timedelta # Added this import
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
 from sqlmodel import Session
@@ -11,8 +10,9 @@ from sqlmodel import Session
 from app.crud import user as crud_user
 from app.api.deps import SessionDep
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash
+from app.core.security import get_password_hash_async
 from app.models import Token, UserCreate, User
+from app.services.token_service import TokenService
 
 router = APIRouter(prefix="/auth/google", tags=["google auth"])
 
@@ -93,11 +93,7 @@ async def google_callback(code: str, session: SessionDep) -> Any:
                 session.commit()
                 session.refresh(user)
             # Authenticate the user and return token
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-            return Token(
-                access_token=create_access_token(user.id, access_token_expires),
-                token_type="bearer",
-            )
+            return TokenService(session).issue_tokens(user)
         else:
             # User does not exist, create a new user
             # Note: We don't get a password from Google, so we'll create a dummy one or handle it differently
@@ -111,7 +107,7 @@ async def google_callback(code: str, session: SessionDep) -> Any:
                 password=password,
             )
             # Crear un objeto User directamente para pasar al CRUD
-            hashed_password = get_password_hash(new_user_in.password)
+            hashed_password = await get_password_hash_async(new_user_in.password)
             user_data = new_user_in.model_dump()
             user_data["hashed_password"] = hashed_password
             user_data.pop("password")
@@ -120,9 +116,4 @@ async def google_callback(code: str, session: SessionDep) -> Any:
                 new_user = crud_user.create_user(session=session, user=db_obj)
             except Exception as e:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error creating user: {e}")
-            access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-            
-            return Token(
-                access_token=create_access_token(new_user.id, access_token_expires),
-                token_type="bearer",
-            )
\ No newline at end of file
+            return TokenService(session).issue_tokens(new_user)
\ No newline at end of file
@@ -1,14 +1,18 @@
+import uuid
 from datetime import timedelta
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.core import security
-from app.api.deps import SessionDep
+from app.api.deps import CurrentPrincipal, SessionDep, TokenDep, decode_token, limit_login_attempts
 from app.core.config import settings
-from app.models import Token
+from app.models import Message, Token
+from app.services.client_service import ClientService
+from app.services.token_service import TokenService
 from app.services.user_service import UserService # Nueva importación
 
 router = APIRouter(tags=["login"])
@@ -17,13 +21,22 @@ def get_user_service(session: SessionDep) -> UserService:
     return UserService(session)
 
 
-@router.post("/login/access-token")
+def get_client_service(session: SessionDep) -> ClientService:
+    return ClientService(session)
+
+
+def get_token_service(session: SessionDep) -> TokenService:
+    return TokenService(session)
+
+
+@router.post("/login/access-token", dependencies=[Depends(limit_login_attempts)])
 async def login_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],  # type: ignore
     user_service: UserService = Depends(get_user_service), # type: ignore
+    token_service: TokenService = Depends(get_token_service), # type: ignore
 ) -> Token:
     """Login with access token."""
-    user = user_service.authenticate(
+    user = await user_service.authenticate(
         email=form_data.username,
         password=form_data.password,
     )
@@ -39,9 +52,62 @@ async def login_access_token(
             detail="Inactive user",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return await run_in_threadpool(token_service.issue_tokens, user)
+
+
+@router.post("/login/refresh-token")
+def login_refresh_token(
+    refresh_token: Annotated[str, Form()],
+    token_service: TokenService = Depends(get_token_service), # type: ignore
+) -> Token:
+    """Exchange a refresh token for a new access token and refresh token."""
+    token = token_service.refresh(refresh_token)
+    if not token:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+
+@router.post("/login/client-token")
+def login_client_token(
+    grant_type: Annotated[str, Form(pattern="^client_credentials$")],
+    client_id: Annotated[uuid.UUID, Form()],
+    client_secret: Annotated[str, Form()],
+    scope: Annotated[str, Form()] = "",
+    client_service: ClientService = Depends(get_client_service), # type: ignore
+) -> Token:
+    """OAuth2 client_credentials grant: issue an access token to a client."""
+    client = client_service.authenticate(client_id=client_id, client_secret=client_secret)
+    if not client:
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect client_id or client_secret",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    requested_scopes = scope.split()
+    if not set(requested_scopes) <= set(client.scopes):
+        raise HTTPException(status_code=400, detail="Invalid scope")
+    access_token_expires = timedelta(minutes=settings.CLIENT_ACCESS_TOKEN_EXPIRE_MINUTES)
     return Token(
         access_token=security.create_access_token(
-            user.id, expires_delta=access_token_expires
+            client.client_id,
+            expires_delta=access_token_expires,
+            claims=security.get_client_access_token_claims(
+                client.client_id, requested_scopes or list(client.scopes)
+            ),
         ),
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/logout", response_model=Message)
+def logout(
+    token: TokenDep,
+    current_user: CurrentPrincipal,
+    token_service: TokenService = Depends(get_token_service), # type: ignore
+) -> Message:
+    """Revoke the access token used for this request."""
+    token_service.revoke_access_token(decode_token(token))
+    return Message(message="Logged out successfully")
@@ -0,0 +1,23 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_active_superuser, token_cache
+from app.core.admission import password_hash_gate
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(get_current_active_superuser)],
+)
+
+
+@router.get("/")
+def read_metrics() -> dict[str, Any]:
+    """
+    In-process counters of this worker.
+    """
+    return {
+        "token_cache": token_cache.stats(),
+        "password_hash_gate": password_hash_gate.stats(),
+    }
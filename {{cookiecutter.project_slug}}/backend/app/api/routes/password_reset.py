@@ -5,16 +5,21 @@ from fastapi import APIRouter, Depends, HTTPException, Form
 from pydantic import EmailStr
 
 from app.core.config import settings
-from app.api.deps import SessionDep
+from app.api.deps import SessionDep, limit_password_reset_requests
 from app.models import User, Message, ResetPassword
 from app.crud import user as crud_user
 from app.utils import generate_password_reset_email, send_email
 from app.core import security
+from app.core.principal import invalidate_principal
 
 router = APIRouter(prefix="/password-reset", tags=["login"])
 
 
-@router.post("/request-password-reset", response_model=Message)
+@router.post(
+    "/request-password-reset",
+    response_model=Message,
+    dependencies=[Depends(limit_password_reset_requests)],
+)
 async def request_password_reset(
     email: EmailStr,
     session: SessionDep,  # type: ignore
@@ -33,6 +38,7 @@ async def request_password_reset(
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_principal(user.id)
 
     if settings.emails_enabled and user.email:
         email_data = generate_password_reset_email(
@@ -62,11 +68,13 @@ async def reset_password(
     if security.is_password_reset_token_expired(user.password_reset_token_expires):
         raise HTTPException(status_code=400, detail="Token expired.")
 
-    user.hashed_password = security.get_password_hash(body.new_password)
+    user.hashed_password = await security.get_password_hash_async(body.new_password)
     user.password_reset_token = None
     user.password_reset_token_expires = None
+    user.token_version += 1
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_principal(user.id)
 
     return Message(message="Password reset successfully.")
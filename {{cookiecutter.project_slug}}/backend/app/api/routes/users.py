@@ -9,6 +9,7 @@ from app.utils.email_utils import generate_new_account_email, send_email
 from app.crud import user as crud_user
 from app.api import deps
 from app import models
+from app.core.principal import Principal
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -21,7 +22,7 @@ def read_users(
     user_service: UserService = Depends(get_user_service),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
@@ -29,26 +30,26 @@ def read_users(
     return user_service.get_multiple_users(skip=skip, limit=limit)
 
 @router.post("/", response_model=models.User)
-def create_user(
+async def create_user(
     *, 
     user_in: models.UserCreate,
     user_service: UserService = Depends(get_user_service),
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Create new user.
     """
-    return user_service.create_user(user_in=user_in)
+    return await user_service.create_user(user_in=user_in)
 
 @router.post("/signup", response_model=models.User)
-def register_user(
+async def register_user(
     user_in: models.UserRegister,
     user_service: UserService = Depends(get_user_service),
 ) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    return user_service.create_user(user_in=user_in)
+    return await user_service.create_user(user_in=user_in)
 
 @router.get("/me", response_model=models.User)
 def read_user_me(current_user: models.User = Depends(deps.get_current_user)) -> Any:
@@ -83,7 +84,7 @@ def update_user(
     user_id: UUID,
     user_in: models.UserUpdate,
     user_service: UserService = Depends(get_user_service),
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
 ) -> models.User:
     """
     Update a user.
@@ -93,7 +94,7 @@ def update_user(
 @router.delete("/{user_id}")
 def delete_user(
     user_id: UUID,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superuser),
     user_service: UserService = Depends(get_user_service),
 ) -> models.User:
     """
@@ -0,0 +1,20 @@
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from app.core import security
+from app.core.config import settings
+
+router = APIRouter(prefix="/.well-known", tags=["well-known"])
+
+
+@router.get("/jwks.json")
+def read_jwks(response: Response) -> dict[str, Any]:
+    """
+    Public keys that verify the access tokens issued by this API, so that other
+    services can validate tokens locally.
+    """
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}"
+    )
+    return security.get_jwks()
@@ -0,0 +1,150 @@
+import asyncio
+import math
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.core.config import settings
+
+
+class OverloadedError(Exception):
+    """
+    Raised when a gate sheds a request instead of queueing it.
+    """
+
+    def __init__(self, gate: str, retry_after: int):
+        super().__init__(f"{gate} is overloaded")
+        self.gate = gate
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Concurrency limit with a bounded wait queue for CPU-heavy work.
+
+    At most max_concurrency callers run at once and at most max_queue wait for
+    a slot; further callers, and callers that wait longer than max_wait
+    seconds, are rejected right away with OverloadedError. Keeping the queue
+    short stops a burst of logins from piling up work that would delay every
+    other request on the worker.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        # Moving average of how long admitted work holds a slot, for Retry-After
+        self.hold_seconds_avg = 0.0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to an event loop; tests and reloads may run several
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self.in_flight = 0
+            self.queue_depth = 0
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """
+        Estimates the whole seconds until the current queue drains.
+        """
+        backlog = (self.queue_depth + 1) * self.hold_seconds_avg / max(1, self.max_concurrency)
+        return max(1, math.ceil(backlog))
+
+    def _reject(self) -> OverloadedError:
+        self.rejected += 1
+        return OverloadedError(self.name, self.retry_after())
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Holds a slot for the duration of the block.
+
+        Raises:
+            OverloadedError: If the queue is full or the wait exceeds max_wait.
+        """
+        semaphore = self._get_semaphore()
+        started = time.monotonic()
+        if not semaphore.locked():
+            # A slot is free, so this acquires without suspending
+            await semaphore.acquire()
+        elif self.queue_depth >= self.max_queue:
+            raise self._reject()
+        else:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.max_wait)
+            except TimeoutError:
+                self.timed_out += 1
+                raise self._reject() from None
+            finally:
+                self.queue_depth -= 1
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.in_flight += 1
+        admitted_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            held = time.monotonic() - admitted_at
+            self.hold_seconds_avg += 0.2 * (held - self.hold_seconds_avg)
+            semaphore.release()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns the current load, the queue depth and the wait time counters.
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "wait_seconds_avg": self.wait_seconds_total / self.admitted if self.admitted else 0.0,
+            "wait_seconds_max": self.wait_seconds_max,
+            "hold_seconds_avg": self.hold_seconds_avg,
+        }
+
+    def reset_stats(self) -> None:
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+
+# Guards the password hashing pool. By default it admits as many hashes as
+# there are hashing workers, so queued work waits here rather than in the pool.
+password_hash_gate = AdmissionGate(
+    "password-hashing",
+    max_concurrency=(
+        settings.HASH_ADMISSION_MAX_CONCURRENCY
+        or settings.PASSWORD_HASH_WORKERS
+        or os.cpu_count()
+        or 1
+    ),
+    max_queue=settings.HASH_ADMISSION_MAX_QUEUE,
+    max_wait=settings.HASH_ADMISSION_MAX_WAIT_SECONDS,
+)
@@ -0,0 +1,78 @@
+import uuid
+from dataclasses import dataclass
+
+from sqlmodel import Session, select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.crud import client as crud_client
+from app.models import Client
+
+
+@dataclass(frozen=True, slots=True)
+class RegisteredClient:
+    """
+    What the client_credentials grant needs to know about an active client.
+    """
+    client_id: uuid.UUID
+    hashed_client_secret: str
+    scopes: tuple[str, ...]
+
+    @classmethod
+    def from_client(cls, client: Client) -> "RegisteredClient":
+        return cls(
+            client_id=client.client_id,
+            hashed_client_secret=client.hashed_client_secret,
+            scopes=tuple(client.scopes or ()),
+        )
+
+
+# Active clients keyed by client_id. The TTL bounds how long changes made by
+# other workers can go unnoticed; local changes invalidate entries directly.
+client_registry = TTLCache(
+    maxsize=settings.CLIENT_REGISTRY_MAX_SIZE,
+    ttl=settings.CLIENT_REGISTRY_TTL_SECONDS,
+)
+
+
+def register_client(client: Client) -> RegisteredClient | None:
+    """
+    Adds an active client to the registry, or drops it if it is inactive.
+    """
+    if not client.is_active:
+        invalidate_client(client.client_id)
+        return None
+    registered = RegisteredClient.from_client(client)
+    client_registry.set(client.client_id, registered)
+    return registered
+
+
+def warm_client_registry(session: Session) -> int:
+    """
+    Loads every active client into the registry and returns how many were loaded.
+    """
+    clients = session.exec(select(Client).where(Client.is_active)).all()
+    for client in clients:
+        register_client(client)
+    return len(clients)
+
+
+def get_registered_client(session: Session, client_id: uuid.UUID) -> RegisteredClient | None:
+    """
+    Returns the active client with client_id, hitting the database only on a miss.
+    """
+    registered = client_registry.get(client_id)
+    if registered is not None:
+        return registered
+    client = crud_client.get_client(session=session, client_id=client_id)
+    if not client:
+        return None
+    return register_client(client)
+
+
+def invalidate_client(client_id: uuid.UUID) -> None:
+    """
+    Drops a client from the registry. Must be called whenever a client is
+    updated or deleted.
+    """
+    client_registry.invalidate(client_id)
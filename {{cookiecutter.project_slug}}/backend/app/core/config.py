@@ -1,5 +1,5 @@
 import secrets
-from typing import Any, Annotated
+from typing import Any, Annotated, Literal
 
 from pydantic import AnyUrl, BeforeValidator, PostgresDsn, computed_field, EmailStr
 
@@ -24,9 +24,61 @@ class Settings(BaseSettings):
     )
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
+    # HS256 signs with SECRET_KEY; RS256/EdDSA sign with JWT_PRIVATE_KEY (PEM) and
+    # publish the public key at /.well-known/jwks.json. Without JWT_PRIVATE_KEY a
+    # key is generated per process, which is only suitable for development.
+    JWT_ALGORITHM: Literal["HS256", "RS256", "EdDSA"] = "HS256"
+    JWT_PRIVATE_KEY: str | None = None
+    # Key ring shared by every worker, as a JSON file path or inline JSON:
+    # {"active": "<kid>", "keys": [{"kid": ..., "algorithm": ..., "key": ...}, ...]}
+    # Keys other than the active one only verify tokens. Takes precedence over
+    # SECRET_KEY/JWT_PRIVATE_KEY for signing.
+    JWT_KEY_RING_FILE: str | None = None
+    JWT_KEY_RING: str | None = None
+    JWKS_CACHE_MAX_AGE_SECONDS: int = 300
+    # Key for hashing client secrets; falls back to SECRET_KEY, so set it explicitly in production
+    CLIENT_SECRET_HMAC_KEY: str | None = None
+    # Access tokens are short-lived and renewed with rotating refresh tokens
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # 60 MINUTES * 24 HOURS * 30 DAYS = 30 DAYS
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 30
     # 60 MINUTES * 24 HOURS * 8 DAYS = 8 DAYS
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Embed authorization claims (is_superuser, is_active, scopes, token_version) in access tokens
+    ACCESS_TOKEN_CLAIMS: bool = False
+    # Access tokens issued to clients through the client_credentials grant
+    CLIENT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     FRONTEND_HOST: str = "http://localhost:5173"
+    # Worker processes used for password hashing; None uses os.cpu_count()
+    PASSWORD_HASH_WORKERS: int | None = None
+    # Admission control for password hashing: concurrent hashes (None matches the
+    # hashing workers), requests allowed to wait for one, and how long they may wait.
+    # Requests beyond that get a 503 with Retry-After instead of queueing.
+    HASH_ADMISSION_MAX_CONCURRENCY: int | None = None
+    HASH_ADMISSION_MAX_QUEUE: int = 32
+    HASH_ADMISSION_MAX_WAIT_SECONDS: float = 2.0
+    # Verified access tokens kept in memory by get_current_user; 0 disables the cache
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    # Principals (id, email, is_active, is_superuser) cached per user; 0 disables the cache
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    # Active clients kept in memory for the client_credentials grant
+    CLIENT_REGISTRY_MAX_SIZE: int = 10_000
+    CLIENT_REGISTRY_TTL_SECONDS: int = 300
+    # In-process Bloom filter in front of the revoked tokens table, synced periodically
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_FALSE_POSITIVE_RATE: float = 0.001
+    REVOCATION_SYNC_SECONDS: int = 5
+    # Sliding window throttling of login and password reset requests, per client IP and
+    # per submitted email. Counters are per process unless RATE_LIMIT_REDIS_URL is set.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REDIS_URL: str | None = None
+    LOGIN_RATE_LIMIT_PER_IP: int = 30
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 10
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
+    PASSWORD_RESET_RATE_LIMIT_PER_IP: int = 10
+    PASSWORD_RESET_RATE_LIMIT_PER_EMAIL: int = 3
+    PASSWORD_RESET_RATE_LIMIT_WINDOW_SECONDS: int = 3600
 
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
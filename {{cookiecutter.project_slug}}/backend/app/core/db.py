@@ -1,3 +1,4 @@
+from sqlalchemy import Connection, text
 from sqlmodel import Session, create_engine, SQLModel
 
 from app.core.config import settings
@@ -9,11 +10,26 @@ engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 print(f"Connecting to database: {settings.SQLALCHEMY_DATABASE_URI}")
 
 
+# Columns added to existing tables after they were first created. create_all
+# only creates missing tables, so databases created earlier need these.
+SCHEMA_UPGRADES = [
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0",
+]
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """Create missing tables and add columns missing from existing ones."""
+    SQLModel.metadata.create_all(connection)
+    for statement in SCHEMA_UPGRADES:
+        connection.execute(text(statement))
+
+
 def init_db(session: Session) -> None:
     """Create the database tables and the first superuser if not exists."""
     
-    # 🧱 Create tables if they do not exist
-    SQLModel.metadata.create_all(engine)
+    # 🧱 Create tables if they do not exist and bring existing ones up to date
+    with engine.begin() as connection:
+        upgrade_schema(connection)
 
     user = crud.get_user_by_email(session=session, email=settings.FIRST_SUPERUSER)
     if not user:
@@ -0,0 +1,55 @@
+import uuid
+from dataclasses import dataclass
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Identity and authorization flags of an authenticated user.
+
+    Enough for routes that only need to know who is calling, without loading
+    the full User row.
+    """
+    id: uuid.UUID
+    email: str | None
+    is_active: bool
+    is_superuser: bool
+    token_version: int = 0
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            token_version=user.token_version,
+        )
+
+
+# Principals keyed by the str user id, kept for a short TTL
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def cache_principal(user: User) -> Principal:
+    """
+    Stores the principal of user in the cache and returns it.
+    """
+    principal = Principal.from_user(user)
+    principal_cache.set(str(user.id), principal)
+    return principal
+
+
+def invalidate_principal(user_id: uuid.UUID | str) -> None:
+    """
+    Drops the cached principal of a user. Must be called whenever a user is
+    updated or deleted, so that changes such as deactivation apply immediately.
+    """
+    principal_cache.invalidate(str(user_id))
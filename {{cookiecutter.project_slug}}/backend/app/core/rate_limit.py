@@ -0,0 +1,167 @@
+import math
+import threading
+import time
+from typing import Protocol
+
+from app.core.config import settings
+
+
+class RateLimitBackend(Protocol):
+    def hit(self, key: str, limit: int, window: int) -> float | None:
+        """
+        Records a hit on key and returns None if it is within limit hits per
+        window seconds, or the seconds to wait before retrying otherwise.
+        """
+        ...
+
+    def reset(self) -> None:
+        ...
+
+
+def _sliding_window_retry_after(
+    previous: int, current: int, limit: int, window: int, elapsed: float
+) -> float | None:
+    # Sliding window counter: the previous fixed window counts in proportion
+    # to how much of it still overlaps the sliding window.
+    weighted = previous * (window - elapsed) / window + current
+    if weighted < limit:
+        return None
+    if current >= limit or previous == 0:
+        return window - elapsed
+    # Time until enough of the previous window has slid out
+    return max(0.0, window - elapsed - (limit - current) * window / previous)
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process sliding window counters.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._windows: dict[str, tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int) -> float | None:
+        now = time.time()
+        index = int(now // window)
+        elapsed = now - index * window
+        with self._lock:
+            window_index, current, previous = self._windows.get(key, (index, 0, 0))
+            if window_index != index:
+                previous = current if window_index == index - 1 else 0
+                current = 0
+            retry_after = _sliding_window_retry_after(previous, current, limit, window, elapsed)
+            if retry_after is None:
+                current += 1
+            self._windows[key] = (index, current, previous)
+            if len(self._windows) > self.max_keys:
+                self._prune(index)
+            return retry_after
+
+    def _prune(self, index: int) -> None:
+        self._windows = {
+            key: value for key, value in self._windows.items() if value[0] >= index - 1
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+
+class RedisRateLimitBackend:
+    """
+    Sliding window counters shared by every worker through Redis.
+
+    Needs the optional redis package.
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def hit(self, key: str, limit: int, window: int) -> float | None:
+        now = time.time()
+        index = int(now // window)
+        elapsed = now - index * window
+        current_key = f"rate-limit:{key}:{index}"
+        pipeline = self._redis.pipeline()
+        pipeline.get(current_key)
+        pipeline.get(f"rate-limit:{key}:{index - 1}")
+        current, previous = pipeline.execute()
+        retry_after = _sliding_window_retry_after(
+            int(previous or 0), int(current or 0), limit, window, elapsed
+        )
+        if retry_after is None:
+            pipeline = self._redis.pipeline()
+            pipeline.incr(current_key)
+            pipeline.expire(current_key, 2 * window)
+            pipeline.execute()
+        return retry_after
+
+    def reset(self) -> None:
+        for key in self._redis.scan_iter("rate-limit:*"):
+            self._redis.delete(key)
+
+
+class RateLimiter:
+    """
+    Applies one limit per key kind (e.g. client IP, submitted email) over a
+    shared sliding window.
+    """
+
+    def __init__(self, name: str, backend: RateLimitBackend, limits: dict[str, int], window: int):
+        self.name = name
+        self.backend = backend
+        self.limits = limits
+        self.window = window
+
+    def hit(self, **keys: str | None) -> int | None:
+        """
+        Records an attempt for every given key and returns None if all of them
+        are within their limits, or the whole seconds to wait otherwise.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        for kind, value in keys.items():
+            if not value:
+                continue
+            retry_after = self.backend.hit(
+                f"{self.name}:{kind}:{value}", self.limits[kind], self.window
+            )
+            if retry_after is not None:
+                return max(1, math.ceil(retry_after))
+        return None
+
+    def reset(self) -> None:
+        self.backend.reset()
+
+
+def _create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+
+rate_limit_backend = _create_backend()
+
+login_rate_limiter = RateLimiter(
+    "login",
+    rate_limit_backend,
+    limits={
+        "ip": settings.LOGIN_RATE_LIMIT_PER_IP,
+        "email": settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+    },
+    window=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
+
+password_reset_rate_limiter = RateLimiter(
+    "password-reset",
+    rate_limit_backend,
+    limits={
+        "ip": settings.PASSWORD_RESET_RATE_LIMIT_PER_IP,
+        "email": settings.PASSWORD_RESET_RATE_LIMIT_PER_EMAIL,
+    },
+    window=settings.PASSWORD_RESET_RATE_LIMIT_WINDOW_SECONDS,
+)
@@ -0,0 +1,128 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.crud import revoked_token as crud_revoked_token
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings, sized for a capacity and a target
+    false-positive rate. Membership tests never give false negatives.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions from the two halves of a single digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate at the current number of items."""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class RevocationList:
+    """
+    Per-worker view of the revoked tokens table.
+
+    A Bloom filter of revoked jtis answers "not revoked" for almost every token
+    without touching the database; only filter hits are confirmed against the
+    store. The filter picks up tokens revoked by other workers every
+    sync_seconds, and is rebuilt from scratch when it fills up, which also
+    drops expired tokens.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float, sync_seconds: float):
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.sync_seconds = sync_seconds
+        self.filter = BloomFilter(capacity, false_positive_rate)
+        self.store_lookups = 0
+        self._synced_at: datetime | None = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def sync(self, session: Session, full: bool = False) -> None:
+        """
+        Adds tokens revoked since the last sync to the filter, or rebuilds it.
+        """
+        with self._lock:
+            full = full or self._synced_at is None or self.filter.count >= self.capacity
+            # Overlap the previous window so clock skew between workers cannot hide a revocation
+            since = None if full else self._synced_at - timedelta(seconds=self.sync_seconds)
+            synced_at = datetime.now(timezone.utc)
+            jtis = crud_revoked_token.get_revoked_jtis(session=session, since=since)
+            if full:
+                bloom_filter = BloomFilter(self.capacity, self.false_positive_rate)
+            else:
+                bloom_filter = self.filter
+            for jti in jtis:
+                bloom_filter.add(jti)
+            self.filter = bloom_filter
+            self._synced_at = synced_at
+            self._next_sync = time.monotonic() + self.sync_seconds
+
+    def revoke(self, session: Session, jti: str, expires_at: datetime) -> None:
+        """
+        Revokes a token in the store and in this worker's filter.
+        """
+        crud_revoked_token.create_revoked_token(session=session, jti=jti, expires_at=expires_at)
+        self.filter.add(jti)
+
+    def is_revoked(self, session: Session, jti: str) -> bool:
+        """
+        Checks whether a token was revoked, querying the store only on filter hits.
+        """
+        if time.monotonic() >= self._next_sync:
+            self.sync(session)
+        if jti not in self.filter:
+            return False
+        self.store_lookups += 1
+        return crud_revoked_token.is_token_revoked(session=session, jti=jti)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns the filter's memory use, fill and expected false-positive rate.
+        """
+        return {
+            "size_bytes": self.filter.size_bytes,
+            "hash_count": self.filter.hash_count,
+            "capacity": self.capacity,
+            "items": self.filter.count,
+            "false_positive_rate": self.filter.false_positive_rate,
+            "store_lookups": self.store_lookups,
+        }
+
+
+revocation_list = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    false_positive_rate=settings.REVOCATION_BLOOM_FALSE_POSITIVE_RATE,
+    sync_seconds=settings.REVOCATION_SYNC_SECONDS,
+)
@@ -1,23 +1,250 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 import secrets
+from typing import TYPE_CHECKING, Any
 
 import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 from passlib.context import CryptContext
 
+from app.core.admission import password_hash_gate
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from app.models import User
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-ALGORITHM = "HS256"
+# Version of the authorization claims layout embedded in access tokens
+TOKEN_CLAIMS_VERSION = 1
+
+# Members of each key type that identify a public JWK (RFC 7638)
+_JWK_THUMBPRINT_MEMBERS = {"RSA": ("e", "kty", "n"), "OKP": ("crv", "kty", "x")}
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    """
+    A JWT signing key identified by its kid.
+
+    For HS256 both keys are the shared secret and there is no public JWK.
+    Retired asymmetric keys may hold only the public key, so signing_key is None.
+    """
+    kid: str
+    algorithm: str
+    signing_key: Any
+    verification_key: Any
+    public_jwk: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class KeyRing:
+    """
+    The active signing key plus retired keys that still verify tokens, by kid.
+    """
+    active: SigningKey
+    keys: dict[str, SigningKey] = field(default_factory=dict)
+
+    def get(self, kid: str) -> SigningKey | None:
+        return self.keys.get(kid)
+
+
+def _jwk_thumbprint(jwk: dict[str, Any]) -> str:
+    members = {name: jwk[name] for name in _JWK_THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":")).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _generate_private_key(algorithm: str) -> Any:
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def load_signing_key(
+    algorithm: str,
+    key: str | None,
+    kid: str | None = None,
+    public_key: str | None = None,
+) -> SigningKey:
+    """
+    Builds a SigningKey from a shared secret (HS256) or a PEM private key.
+
+    Args:
+        algorithm: HS256, RS256 or EdDSA.
+        key: The secret or PEM private key. For asymmetric algorithms a new
+            private key is generated when neither key nor public_key is given.
+        kid: The key id. Derived from the key when omitted.
+        public_key: A PEM public key, for retired keys that only verify tokens.
+    """
+    if algorithm == "HS256":
+        if not key:
+            raise ValueError("HS256 signing keys need a secret")
+        kid = kid or hashlib.sha256(key.encode()).hexdigest()[:16]
+        return SigningKey(kid=kid, algorithm=algorithm, signing_key=key, verification_key=key)
+    if key:
+        private_key = serialization.load_pem_private_key(key.encode(), password=None)
+        verification_key = private_key.public_key()
+    elif public_key:
+        private_key = None
+        verification_key = serialization.load_pem_public_key(public_key.encode())
+    else:
+        private_key = _generate_private_key(algorithm)
+        verification_key = private_key.public_key()
+    public_jwk = jwt.get_algorithm_by_name(algorithm).to_jwk(verification_key, as_dict=True)
+    kid = kid or _jwk_thumbprint(public_jwk)
+    public_jwk.update(kid=kid, alg=algorithm, use="sig")
+    return SigningKey(
+        kid=kid,
+        algorithm=algorithm,
+        signing_key=private_key,
+        verification_key=verification_key,
+        public_jwk=public_jwk,
+    )
+
+
+def load_key_ring(config: dict[str, Any]) -> KeyRing:
+    """
+    Builds a KeyRing from its JSON configuration.
+
+    Raises:
+        ValueError: If the active kid is missing or cannot sign.
+    """
+    keys = {}
+    for entry in config["keys"]:
+        signing_key = load_signing_key(
+            entry["algorithm"],
+            entry.get("key"),
+            kid=entry["kid"],
+            public_key=entry.get("public_key"),
+        )
+        keys[signing_key.kid] = signing_key
+    active = keys.get(config["active"])
+    if active is None or active.signing_key is None:
+        raise ValueError(f"Active key {config['active']!r} is missing or has no private key")
+    return KeyRing(active=active, keys=keys)
+
+
+def _load_configured_key_ring() -> KeyRing:
+    if settings.JWT_KEY_RING_FILE:
+        with open(settings.JWT_KEY_RING_FILE, encoding="utf-8") as key_ring_file:
+            return load_key_ring(json.load(key_ring_file))
+    if settings.JWT_KEY_RING:
+        return load_key_ring(json.loads(settings.JWT_KEY_RING))
+    key = settings.SECRET_KEY if settings.JWT_ALGORITHM == "HS256" else settings.JWT_PRIVATE_KEY
+    signing_key = load_signing_key(settings.JWT_ALGORITHM, key)
+    return KeyRing(active=signing_key, keys={signing_key.kid: signing_key})
+
+
+_key_ring: KeyRing | None = None
+
+
+def get_key_ring() -> KeyRing:
+    """Return the signing key ring, loading it on first use."""
+    global _key_ring
+    if _key_ring is None:
+        _key_ring = _load_configured_key_ring()
+    return _key_ring
+
+
+def reload_key_ring() -> KeyRing:
+    """Reload the key ring from its configuration, e.g. after a key rotation."""
+    global _key_ring
+    _key_ring = None
+    return get_key_ring()
+
+
+def get_signing_key() -> SigningKey:
+    """Return the key new tokens are signed with."""
+    return get_key_ring().active
+
+
+def get_verification_key(kid: str | None) -> SigningKey | None:
+    """
+    Return the key that verifies tokens signed with kid. Tokens issued before
+    kid headers were added are verified with the active key.
+    """
+    key_ring = get_key_ring()
+    if kid is None:
+        return key_ring.active
+    return key_ring.get(kid)
+
+
+def get_jwks() -> dict[str, Any]:
+    """Return the JSON Web Key Set with the public keys that verify our tokens."""
+    keys = [key.public_jwk for key in get_key_ring().keys.values() if key.public_jwk]
+    return {"keys": keys}
 
 
-def create_access_token(subject: str, expires_delta: timedelta) -> str:
+def create_access_token(
+    subject: str, expires_delta: timedelta, claims: dict[str, Any] | None = None
+) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    to_encode = {"exp": expire, "sub": str(subject), "jti": secrets.token_urlsafe(16)}
+    if claims:
+        to_encode.update(claims)
+    signing_key = get_signing_key()
+    encoded_jwt = jwt.encode(
+        to_encode,
+        signing_key.signing_key,
+        algorithm=signing_key.algorithm,
+        headers={"kid": signing_key.kid},
+    )
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict[str, Any]:
+    """
+    Verify an access token with the key named by its kid header and return its claims.
+
+    Raises:
+        InvalidTokenError: If the token is malformed, expired, or signed with an unknown key.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    verification_key = get_verification_key(kid)
+    if verification_key is None:
+        raise jwt.InvalidTokenError(f"Unknown signing key {kid!r}")
+    return jwt.decode(
+        token, verification_key.verification_key, algorithms=[verification_key.algorithm]
+    )
+
+
+def get_access_token_claims(user: "User") -> dict[str, Any] | None:
+    """
+    Returns the authorization claims to embed in the user's access tokens, or
+    None when self-contained tokens are disabled.
+    """
+    if not settings.ACCESS_TOKEN_CLAIMS:
+        return None
+    return {
+        "ver": TOKEN_CLAIMS_VERSION,
+        "is_superuser": user.is_superuser,
+        "is_active": user.is_active,
+        "scopes": [],
+        "token_version": user.token_version,
+    }
+
+
+def get_client_access_token_claims(client_id: Any, scopes: list[str]) -> dict[str, Any]:
+    """
+    Returns the claims of an access token issued to a client.
+    """
+    return {
+        "ver": TOKEN_CLAIMS_VERSION,
+        "client_id": str(client_id),
+        "scopes": scopes,
+    }
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -25,17 +252,85 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+_hash_executor: ProcessPoolExecutor | None = None
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    """Return the process pool used for password hashing, creating it lazily."""
+    global _hash_executor
+    if _hash_executor is None:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count(),
+            mp_context=context,
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the password hashing pool, if it was started."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    async with password_hash_gate.admit():
+        return await loop.run_in_executor(
+            get_hash_executor(), verify_password, plain_password, hashed_password
+        )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the hashing pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    async with password_hash_gate.admit():
+        return await loop.run_in_executor(get_hash_executor(), get_password_hash, password)
+
+
+# Client secrets are random and high-entropy, so a keyed HMAC is enough and
+# avoids paying for a slow KDF on every machine-to-machine authentication.
+CLIENT_SECRET_SCHEME = "hmac-sha256"
+
+
+def _client_secret_digest(secret: str) -> str:
+    key = settings.CLIENT_SECRET_HMAC_KEY or settings.SECRET_KEY
+    return hmac.new(key.encode(), secret.encode(), hashlib.sha256).hexdigest()
+
+
+def get_client_secret_hash(secret: str) -> str:
+    return f"{CLIENT_SECRET_SCHEME}${_client_secret_digest(secret)}"
+
+
 def verify_client_secret(plain_secret: str, hashed_secret: str) -> bool:
+    scheme, _, digest = hashed_secret.partition("$")
+    if scheme == CLIENT_SECRET_SCHEME:
+        return hmac.compare_digest(digest, _client_secret_digest(plain_secret))
+    # Rows created before the HMAC scheme hold bcrypt hashes
     return pwd_context.verify(plain_secret, hashed_secret)
 
-def get_client_secret_hash(secret: str) -> str:
-    return pwd_context.hash(secret)
+
+def client_secret_needs_update(hashed_secret: str) -> bool:
+    return not hashed_secret.startswith(f"{CLIENT_SECRET_SCHEME}$")
+
+
+def generate_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+def get_refresh_token_hash(token: str) -> str:
+    # Refresh tokens are random and high-entropy, so a plain digest is enough
+    return hashlib.sha256(token.encode()).hexdigest()
 
 def generate_password_reset_token(email: str) -> str:
     return secrets.token_urlsafe(32)
 
 def get_password_reset_token_expire_time() -> datetime:
-    return datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return datetime.now(timezone.utc) + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
 
 def is_password_reset_token_expired(expires_at: datetime) -> bool:
     return datetime.now(timezone.utc) > expires_at.replace(tzinfo=timezone.utc)
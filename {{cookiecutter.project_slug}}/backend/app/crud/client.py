@@ -6,11 +6,24 @@ from fastapi import HTTPException
 from sqlmodel import Session, select
 from sqlalchemy import func
 
-from app.core.security import get_password_hash
+from app.core.security import get_client_secret_hash
 from app.models import Client, ClientCreate, ClientUpdate
 
 
-def create_client(*, session: Session, client_create: ClientCreate, owner_id: UUID) -> Client:
+def generate_client_secret() -> str:
+    """
+    Generates a new random client_secret.
+    """
+    return str(uuid.uuid4())
+
+
+def create_client(
+    *,
+    session: Session,
+    client_create: ClientCreate,
+    owner_id: UUID,
+    client_secret: str | None = None,
+) -> Client:
     """
     Creates a new client in the database.
 
@@ -18,18 +31,19 @@ def create_client(*, session: Session, client_create: ClientCreate, owner_id: UU
         session: The database session.
         client_create: The client data to create.
         owner_id: The ID of the user who owns this client.
+        client_secret: A pre-generated client_secret. A random one is generated if omitted.
 
     Returns:
         The created Client object.
     """
-    # Generate a random client_secret for the new client
-    client_secret = str(uuid.uuid4())
+    if client_secret is None:
+        client_secret = generate_client_secret()
     db_obj = Client(
         name=client_create.name,
         redirect_uris=client_create.redirect_uris or [],
         scopes=client_create.scopes or [],
         is_active=client_create.is_active,
-        hashed_client_secret=get_password_hash(client_secret),
+        hashed_client_secret=get_client_secret_hash(client_secret),
         owner_id=owner_id,
     )
     print(f"db_obj before add: {db_obj.model_dump_json()}")
@@ -62,6 +76,21 @@ def get_client_by_client_id(*, session: Session, client_id: str) -> Client:
     return session_client
 
 
+def get_client(*, session: Session, client_id: UUID) -> Client | None:
+    """
+    Retrieves a client by its client_id without raising when it does not exist.
+
+    Args:
+        session: The database session.
+        client_id: The client_id of the client to retrieve.
+
+    Returns:
+        The Client object if found, otherwise None.
+    """
+    statement = select(Client).where(Client.client_id == client_id)
+    return session.exec(statement).first()
+
+
 def update_client(*, session: Session, db_client: Client, client_in: ClientUpdate) -> Client:
     """
     Updates an existing client in the database.
@@ -82,6 +111,25 @@ def update_client(*, session: Session, db_client: Client, client_in: ClientUpdat
     return db_client
 
 
+def update_client_secret_hash(*, session: Session, db_client: Client, hashed_client_secret: str) -> Client:
+    """
+    Replaces the stored hash of a client's secret.
+
+    Args:
+        session: The database session.
+        db_client: The existing Client object from the database.
+        hashed_client_secret: The new hash of the client_secret.
+
+    Returns:
+        The updated Client object.
+    """
+    db_client.hashed_client_secret = hashed_client_secret
+    session.add(db_client)
+    session.commit()
+    session.refresh(db_client)
+    return db_client
+
+
 def delete_client(*, session: Session, db_client: Client) -> None:
     """
     Deletes a client from the database.
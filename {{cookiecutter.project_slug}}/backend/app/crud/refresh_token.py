@@ -0,0 +1,131 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Row, func, select, update
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.security import generate_refresh_token, get_refresh_token_hash
+from app.models import RefreshToken, User
+
+
+def create_refresh_token(
+    *, session: Session, user_id: uuid.UUID, token_version: int, family_id: uuid.UUID | None = None
+) -> str:
+    """
+    Stores a new refresh token and returns it. Only its hash is persisted.
+
+    Args:
+        session: The database session.
+        user_id: The ID of the user the token is issued to.
+        token_version: The user's current token_version.
+        family_id: The rotation family to continue. A new family is started if omitted.
+
+    Returns:
+        The plain refresh token.
+    """
+    token = generate_refresh_token()
+    session.add(
+        RefreshToken(
+            token_hash=get_refresh_token_hash(token),
+            user_id=user_id,
+            family_id=family_id or uuid.uuid4(),
+            token_version=token_version,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+        )
+    )
+    session.commit()
+    return token
+
+
+def use_refresh_token(*, session: Session, token: str) -> Row | None:
+    """
+    Atomically marks a refresh token as used, if it is still valid.
+
+    A token is valid if it is unused, not revoked, not expired, and was issued
+    for the current token_version of an active user. The lookup goes through
+    the unique token_hash index and is a single UPDATE ... RETURNING, so two
+    concurrent refreshes with the same token cannot both succeed.
+
+    Args:
+        session: The database session.
+        token: The plain refresh token.
+
+    Returns:
+        A row with family_id and the user's id, is_active, is_superuser and
+        token_version, or None if the token is not valid.
+    """
+    statement = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == get_refresh_token_hash(token),
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > func.now(),
+            RefreshToken.user_id == User.id,
+            RefreshToken.token_version == User.token_version,
+            User.is_active.is_(True),
+        )
+        .values(used_at=func.now())
+        .execution_options(synchronize_session=False)
+        .returning(
+            RefreshToken.family_id,
+            User.id,
+            User.is_active,
+            User.is_superuser,
+            User.token_version,
+        )
+    )
+    row = session.execute(statement).first()
+    session.commit()
+    return row
+
+
+def revoke_reused_refresh_token_family(*, session: Session, token: str) -> int:
+    """
+    Revokes the whole family of a refresh token that was already used.
+
+    Presenting a used token means it was copied, so neither the thief nor the
+    legitimate holder may keep refreshing.
+
+    Args:
+        session: The database session.
+        token: The plain refresh token.
+
+    Returns:
+        The number of revoked tokens.
+    """
+    reused_family = (
+        select(RefreshToken.family_id)
+        .where(
+            RefreshToken.token_hash == get_refresh_token_hash(token),
+            RefreshToken.used_at.is_not(None),
+        )
+        .scalar_subquery()
+    )
+    statement = (
+        update(RefreshToken)
+        .where(RefreshToken.family_id == reused_family, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+        .execution_options(synchronize_session=False)
+    )
+    result = session.execute(statement)
+    session.commit()
+    return result.rowcount
+
+
+def delete_expired_refresh_tokens(*, session: Session) -> int:
+    """
+    Deletes expired refresh tokens.
+
+    Args:
+        session: The database session.
+
+    Returns:
+        The number of deleted tokens.
+    """
+    result = session.execute(
+        RefreshToken.__table__.delete().where(RefreshToken.expires_at <= func.now())
+    )
+    session.commit()
+    return result.rowcount
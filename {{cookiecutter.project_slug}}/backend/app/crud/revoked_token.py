@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models import RevokedToken
+
+
+def create_revoked_token(*, session: Session, jti: str, expires_at: datetime) -> RevokedToken:
+    """
+    Records an access token as revoked.
+
+    Args:
+        session: The database session.
+        jti: The jti claim of the token.
+        expires_at: When the token expires; the row is useless afterwards.
+
+    Returns:
+        The created RevokedToken object.
+    """
+    revoked_token = session.get(RevokedToken, jti)
+    if revoked_token:
+        return revoked_token
+    revoked_token = RevokedToken(jti=jti, expires_at=expires_at)
+    session.add(revoked_token)
+    session.commit()
+    return revoked_token
+
+
+def is_token_revoked(*, session: Session, jti: str) -> bool:
+    """
+    Checks the revocation store for a jti.
+
+    Args:
+        session: The database session.
+        jti: The jti claim of the token.
+
+    Returns:
+        True if the token was revoked.
+    """
+    return session.get(RevokedToken, jti) is not None
+
+
+def get_revoked_jtis(*, session: Session, since: datetime | None = None) -> list[str]:
+    """
+    Lists the jtis of revoked tokens that have not expired yet.
+
+    Args:
+        session: The database session.
+        since: Only return tokens revoked after this time.
+
+    Returns:
+        A list of jtis.
+    """
+    statement = select(RevokedToken.jti).where(RevokedToken.expires_at > func.now())
+    if since is not None:
+        statement = statement.where(RevokedToken.revoked_at > since)
+    return list(session.exec(statement).all())
+
+
+def delete_expired_revoked_tokens(*, session: Session) -> int:
+    """
+    Deletes revoked tokens that have expired anyway.
+
+    Args:
+        session: The database session.
+
+    Returns:
+        The number of deleted rows.
+    """
+    result = session.execute(
+        RevokedToken.__table__.delete().where(RevokedToken.expires_at <= func.now())
+    )
+    session.commit()
+    return result.rowcount
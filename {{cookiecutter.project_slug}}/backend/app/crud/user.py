@@ -3,7 +3,7 @@ import uuid
 from fastapi import HTTPException
 
 from sqlmodel import Session, select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 from app.core.security import get_password_hash, verify_password
 from app.models import User, UserCreate, UserUpdate
@@ -118,4 +118,21 @@ def delete_user(*, session: Session, user: User) -> None:
         user: The User object to delete.
     """
     session.delete(user)
-    session.commit()
\ No newline at end of file
+    session.commit()
+
+
+def increment_token_version(*, session: Session, user_id: uuid.UUID) -> None:
+    """
+    Incrementa atómicamente el token_version de un usuario, revocando todos sus tokens.
+
+    Args:
+        session: La sesión de la base de datos.
+        user_id: El ID del usuario.
+    """
+    statement = (
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+    )
+    session.exec(statement)
+    session.commit()
@@ -8,9 +8,17 @@ from pydantic import ValidationError
 from sqlmodel import Session
 
 from app.api.main import api_router
+from app.api.routes import well_known
 from app.core.db import init_db, engine
+from app.core.client_registry import warm_client_registry
 from app.core.config import settings
-from app.api.errors.handlers import http_exception_handler, validation_exception_handler
+from app.core.security import shutdown_hash_executor
+from app.core.admission import OverloadedError
+from app.api.errors.handlers import (
+    http_exception_handler,
+    overloaded_exception_handler,
+    validation_exception_handler,
+)
 
 
 def custom_generate_unique_id(route: APIRouter) -> str:
@@ -24,7 +32,9 @@ async def lifespan(app: FastAPI):
     # 🔹 Logic to initialize the DB at startup
     with Session(engine) as session:
         init_db(session)
+        warm_client_registry(session)
     yield
+    shutdown_hash_executor()
 
 
 app = FastAPI(
@@ -36,6 +46,7 @@ app = FastAPI(
 
 app.exception_handler(HTTPException)(http_exception_handler)
 app.exception_handler(ValidationError)(validation_exception_handler)
+app.exception_handler(OverloadedError)(overloaded_exception_handler)
 
 
 # set all CORS enabled origins
@@ -48,4 +59,6 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
\ No newline at end of file
+app.include_router(api_router, prefix=settings.API_V1_STR)
+# Served at the root, where resource servers expect to discover signing keys
+app.include_router(well_known.router)
\ No newline at end of file
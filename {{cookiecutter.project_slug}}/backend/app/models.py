@@ -29,6 +29,36 @@ class User(UserBase, table=True):
     password_reset_token: str | None = Field(default=None, index=True)
     password_reset_token_expires: datetime | None = Field(default=None)
     google_id: str | None = Field(default=None, unique=True, index=True) # Added for Google OAuth
+    # Bumped to revoke every access token issued to the user
+    token_version: int = Field(default=0)
+
+
+# Refresh tokens are stored hashed. Each login starts a family; every refresh
+# marks the presented token used and issues the next one in the same family.
+class RefreshToken(SQLModel, table=True):
+    __tablename__ = "refresh_tokens"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    token_hash: str = Field(max_length=64, unique=True, index=True)
+    user_id: uuid.UUID = Field(foreign_key="users.id", index=True, ondelete="CASCADE")
+    family_id: uuid.UUID = Field(index=True)
+    # The user's token_version when issued; a bump invalidates the token
+    token_version: int = Field(default=0)
+    expires_at: datetime = Field(sa_column=sa.Column(sa.DateTime(timezone=True), nullable=False))
+    used_at: datetime | None = Field(default=None, sa_column=sa.Column(sa.DateTime(timezone=True)))
+    revoked: bool = False
+
+
+# Access tokens revoked before their exp, by jti. Rows can be purged once expired.
+class RevokedToken(SQLModel, table=True):
+    __tablename__ = "revoked_tokens"
+
+    jti: str = Field(primary_key=True, max_length=64)
+    expires_at: datetime = Field(sa_column=sa.Column(sa.DateTime(timezone=True), nullable=False))
+    revoked_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=sa.Column(sa.DateTime(timezone=True), nullable=False, index=True),
+    )
 
 
 # Shared properties for Client
@@ -135,12 +165,23 @@ class Message(SQLModel):
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: str | None = None
+    jti: str | None = None
+    exp: int | None = None
+    # Authorization claims, only present in self-contained tokens
+    ver: int | None = None
+    is_superuser: bool | None = None
+    is_active: bool | None = None
+    scopes: list[str] = []
+    token_version: int | None = None
+    # Only present in tokens issued to clients through the client_credentials grant
+    client_id: str | None = None
 
 
 # JSON payload containing access token
 class Token(SQLModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
 
 
 class ResetPassword(SQLModel):
@@ -4,6 +4,13 @@ from uuid import UUID
 from fastapi import HTTPException
 from sqlmodel import Session
 
+from app.core.client_registry import (
+    RegisteredClient,
+    get_registered_client,
+    invalidate_client,
+    register_client,
+)
+from app.core.security import client_secret_needs_update, get_client_secret_hash, verify_client_secret
 from app.crud import client as crud_client
 from app.models import Client, ClientCreate, ClientUpdate, ClientCreateResponse
 
@@ -14,6 +21,7 @@ class ClientService:
 
     def create_client(self, client_in: ClientCreate, owner_id: UUID) -> ClientCreateResponse:
         db_client, client_secret = crud_client.create_client(session=self.db, client_create=client_in, owner_id=owner_id)
+        register_client(db_client)
         return ClientCreateResponse(client_secret=client_secret, **db_client.model_dump())
 
 
@@ -22,11 +30,31 @@ class ClientService:
 
     def update_client(self, client_id: str, client_in: ClientUpdate) -> Client:
         db_client = crud_client.get_client_by_client_id(session=self.db, client_id=client_id)
-        return crud_client.update_client(session=self.db, db_client=db_client, client_in=client_in)
+        updated_client = crud_client.update_client(session=self.db, db_client=db_client, client_in=client_in)
+        invalidate_client(updated_client.client_id)
+        return updated_client
 
     def delete_client(self, client_id: str) -> None:
         db_client = crud_client.get_client_by_client_id(session=self.db, client_id=client_id)
         crud_client.delete_client(session=self.db, db_client=db_client)
+        invalidate_client(db_client.client_id)
+
+    def authenticate(self, client_id: UUID, client_secret: str) -> RegisteredClient | None:
+        registered = get_registered_client(self.db, client_id)
+        if not registered:
+            return None
+        if not verify_client_secret(client_secret, registered.hashed_client_secret):
+            return None
+        if client_secret_needs_update(registered.hashed_client_secret):
+            # Upgrade legacy bcrypt rows to the HMAC scheme on their first successful check
+            db_client = crud_client.get_client_by_client_id(session=self.db, client_id=client_id)
+            db_client = crud_client.update_client_secret_hash(
+                session=self.db,
+                db_client=db_client,
+                hashed_client_secret=get_client_secret_hash(client_secret),
+            )
+            registered = register_client(db_client)
+        return registered
 
     def get_multiple_clients(self, skip: int, limit: int) -> dict[str, Any]:
         return crud_client.get_multiple_clients(session=self.db, skip=skip, limit=limit)
\ No newline at end of file
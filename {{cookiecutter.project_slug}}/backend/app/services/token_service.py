@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core import security
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.crud import refresh_token as crud_refresh_token
+from app.models import Token, TokenPayload, User
+
+
+class TokenService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def issue_tokens(self, user: User) -> Token:
+        """Issue an access token and the first refresh token of a new family."""
+        refresh_token = crud_refresh_token.create_refresh_token(
+            session=self.db, user_id=user.id, token_version=user.token_version
+        )
+        return Token(access_token=self._create_access_token(user), refresh_token=refresh_token)
+
+    def refresh(self, refresh_token: str) -> Token | None:
+        """
+        Exchange a refresh token for a new access token and the next refresh
+        token of its family. Reusing an already rotated token revokes the family.
+        """
+        row = crud_refresh_token.use_refresh_token(session=self.db, token=refresh_token)
+        if row is None:
+            crud_refresh_token.revoke_reused_refresh_token_family(session=self.db, token=refresh_token)
+            return None
+        next_refresh_token = crud_refresh_token.create_refresh_token(
+            session=self.db,
+            user_id=row.id,
+            token_version=row.token_version,
+            family_id=row.family_id,
+        )
+        return Token(access_token=self._create_access_token(row), refresh_token=next_refresh_token)
+
+    def revoke_access_token(self, token_data: TokenPayload) -> None:
+        """Revoke an access token until it expires."""
+        if not token_data.jti or not token_data.exp:
+            return
+        expires_at = datetime.fromtimestamp(token_data.exp, tz=timezone.utc)
+        revocation_list.revoke(self.db, token_data.jti, expires_at)
+
+    @staticmethod
+    def _create_access_token(user: User) -> str:
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        return security.create_access_token(
+            user.id,
+            expires_delta=access_token_expires,
+            claims=security.get_access_token_claims(user),
+        )
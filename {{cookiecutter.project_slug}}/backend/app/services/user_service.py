@@ -1,48 +1,52 @@
 from typing import Any
 from uuid import UUID
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session
 from app.crud import user as crud_user
 from app import models
 from app.core.config import settings
 from app.utils.email_utils import generate_new_account_email, send_email
 from app.models import User
-from app.core.security import get_password_hash, verify_password # Nueva importación
+from app.core.principal import Principal, invalidate_principal
+from app.core.security import get_password_hash, get_password_hash_async, verify_password_async
 
 
 class UserService:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_user(self, user_in: models.UserCreate) -> models.User:
-        user = crud_user.get_user_by_email(session=self.db, email=user_in.email)
+    async def create_user(self, user_in: models.UserCreate) -> models.User:
+        # Blocking database and SMTP calls go to the threadpool, only the hash to the hashing pool
+        user = await run_in_threadpool(crud_user.get_user_by_email, session=self.db, email=user_in.email)
         if user:
             raise HTTPException(
                 status_code=400,
                 detail="The user with this email already exists in the system.",
             )
         # Hashear la contraseña aquí
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await get_password_hash_async(user_in.password)
         user_data = user_in.model_dump()
         user_data["hashed_password"] = hashed_password
         user_data.pop("password") # Eliminar la contraseña en texto plano
 
         # Crear un objeto User directamente para pasar al CRUD
         db_obj = models.User(**user_data)
-        new_user = crud_user.create_user(session=self.db, user=db_obj) # Cambiar user_create a user
+        new_user = await run_in_threadpool(crud_user.create_user, session=self.db, user=db_obj) # Cambiar user_create a user
         
         if settings.emails_enabled and user_in.email:
             email_data = generate_new_account_email(
                 email_to=user_in.email, username=user_in.email, password=user_in.password
             )
-            send_email(
+            await run_in_threadpool(
+                send_email,
                 email_to=user_in.email,
                 email_data=email_data,
             )
         return new_user
 
 
-    def delete_user(self, user_id: UUID, current_user: models.User) -> models.User:
+    def delete_user(self, user_id: UUID, current_user: Principal) -> models.User:
         user_to_delete = crud_user.get_user_by_id(session=self.db, user_id=user_id)
         
         if not user_to_delete:
@@ -55,6 +59,7 @@ class UserService:
             )
 
         crud_user.delete_user(session=self.db, user=user_to_delete)
+        invalidate_principal(user_to_delete.id)
         return user_to_delete
 
     def update_user(self, user_id: UUID, user_in: models.UserUpdate) -> models.User:
@@ -80,7 +85,12 @@ class UserService:
             user_data["hashed_password"] = hashed_password
             user_data.pop("password")
 
-        return crud_user.update_user(session=self.db, db_user=user_to_update, user_data=user_data)
+        if self._revokes_tokens(user_to_update, user_data):
+            user_data["token_version"] = user_to_update.token_version + 1
+
+        updated_user = crud_user.update_user(session=self.db, db_user=user_to_update, user_data=user_data)
+        invalidate_principal(updated_user.id)
+        return updated_user
 
     def delete_user_me(self, current_user: models.User) -> models.Message:
         if current_user.is_superuser:
@@ -88,6 +98,7 @@ class UserService:
                 status_code=400, detail="Superusers can't delete themselves."
             )
         crud_user.delete_user(session=self.db, user=current_user)
+        invalidate_principal(current_user.id)
         return models.Message(message="User deleted successfully")
 
 
@@ -105,14 +116,34 @@ class UserService:
             hashed_password = get_password_hash(user_data["password"])
             user_data["hashed_password"] = hashed_password
             user_data.pop("password")
-        
-        return crud_user.update_user(session=self.db, db_user=current_user, user_data=user_data)
 
-    def authenticate(self, email: str, password: str) -> User | None:
-        db_user = crud_user.get_user_by_email(session=self.db, email=email)
+        if self._revokes_tokens(current_user, user_data):
+            user_data["token_version"] = current_user.token_version + 1
+
+        updated_user = crud_user.update_user(session=self.db, db_user=current_user, user_data=user_data)
+        invalidate_principal(updated_user.id)
+        return updated_user
+
+    def revoke_tokens(self, user_id: UUID) -> None:
+        """Invalidate every self-contained access token issued to the user."""
+        crud_user.increment_token_version(session=self.db, user_id=user_id)
+        invalidate_principal(user_id)
+
+    @staticmethod
+    def _revokes_tokens(db_user: models.User, user_data: dict[str, Any]) -> bool:
+        # Tokens embed is_active/is_superuser, so changing them or the password revokes them
+        if "hashed_password" in user_data:
+            return True
+        return any(
+            field in user_data and user_data[field] is not None and user_data[field] != getattr(db_user, field)
+            for field in ("is_active", "is_superuser")
+        )
+
+    async def authenticate(self, email: str, password: str) -> User | None:
+        db_user = await run_in_threadpool(crud_user.get_user_by_email, session=self.db, email=email)
         if not db_user:
             return None
-        if not verify_password(password, db_user.hashed_password):
+        if not await verify_password_async(password, db_user.hashed_password):
             return None
         return db_user
 
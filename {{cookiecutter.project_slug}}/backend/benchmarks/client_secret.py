@@ -0,0 +1,33 @@
+"""
+Compares the cost of verifying client secrets with bcrypt and with the
+HMAC-SHA256 scheme used for Client.hashed_client_secret.
+
+Usage:
+    python -m benchmarks.client_secret [iterations]
+"""
+import sys
+import timeit
+import uuid
+
+from app.core.security import get_client_secret_hash, pwd_context, verify_client_secret
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    secret = str(uuid.uuid4())
+    schemes = {
+        "bcrypt": pwd_context.hash(secret),
+        "hmac-sha256": get_client_secret_hash(secret),
+    }
+    results = {}
+    for name, hashed_secret in schemes.items():
+        seconds = timeit.timeit(
+            lambda: verify_client_secret(secret, hashed_secret), number=iterations
+        )
+        results[name] = seconds / iterations
+        print(f"{name:>12}: {results[name] * 1e6:12.1f} us/verify ({iterations} iterations)")
+    print(f"     speedup: {results['bcrypt'] / results['hmac-sha256']:12.0f}x")
+
+
+if __name__ == "__main__":
+    main()
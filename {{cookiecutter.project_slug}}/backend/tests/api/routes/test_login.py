@@ -1,8 +1,18 @@
+import uuid
 from http import HTTPStatus
+from unittest.mock import patch
+
+import jwt
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+from app.core.admission import password_hash_gate
+from app.core.client_registry import client_registry
 from app.core.config import settings
+from app.core.rate_limit import login_rate_limiter
+from app.crud import client as crud_client
+from app.models import ClientCreate, RefreshToken, User
+from app.services.user_service import UserService
 from tests.factories import UserFactory
 
 
@@ -47,4 +57,171 @@ def test_authenticate_inactive_user(client: TestClient, db: Session) -> None:
     }
     r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
     assert r.status_code == HTTPStatus.BAD_REQUEST
-    assert r.json()["detail"] == "Inactive user"
\ No newline at end of file
+    assert r.json()["detail"] == "Inactive user"
+
+
+def _create_client(db: Session, owner: User, scopes: list[str]) -> tuple[str, str]:
+    client_in = ClientCreate(name="Machine Client", redirect_uris=[], scopes=scopes)
+    db_client, client_secret = crud_client.create_client(session=db, client_create=client_in, owner_id=owner.id)
+    return str(db_client.client_id), client_secret
+
+
+def test_client_credentials_token(client: TestClient, db: Session, superuser: User) -> None:
+    client_id, client_secret = _create_client(db, superuser, ["read", "write"])
+    form = {
+        "grant_type": "client_credentials",
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "scope": "read",
+    }
+    r = client.post(f"{settings.API_V1_STR}/login/client-token", data=form)
+    assert r.status_code == HTTPStatus.OK
+    claims = jwt.decode(r.json()["access_token"], options={"verify_signature": False})
+    assert claims["client_id"] == client_id
+    assert claims["scopes"] == ["read"]
+
+    # The registry now serves the client, and the token is not a user token
+    assert client_registry.get(uuid.UUID(client_id)) is not None
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_client_credentials_invalid_secret_and_scope(client: TestClient, db: Session, superuser: User) -> None:
+    client_id, client_secret = _create_client(db, superuser, ["read"])
+    form = {"grant_type": "client_credentials", "client_id": client_id, "client_secret": "wrong"}
+    r = client.post(f"{settings.API_V1_STR}/login/client-token", data=form)
+    assert r.status_code == HTTPStatus.UNAUTHORIZED
+    assert r.json()["detail"] == "Incorrect client_id or client_secret"
+
+    form = {**form, "client_secret": client_secret, "scope": "admin"}
+    r = client.post(f"{settings.API_V1_STR}/login/client-token", data=form)
+    assert r.status_code == HTTPStatus.BAD_REQUEST
+    assert r.json()["detail"] == "Invalid scope"
+
+
+def test_client_credentials_deactivated_client(
+    client: TestClient, db: Session, superuser: User, superuser_token_headers: dict[str, str]
+) -> None:
+    client_id, client_secret = _create_client(db, superuser, [])
+    form = {"grant_type": "client_credentials", "client_id": client_id, "client_secret": client_secret}
+    assert client.post(f"{settings.API_V1_STR}/login/client-token", data=form).status_code == HTTPStatus.OK
+
+    r = client.put(
+        f"{settings.API_V1_STR}/clients/{client_id}", headers=superuser_token_headers, json={"is_active": False}
+    )
+    assert r.status_code == HTTPStatus.OK
+    r = client.post(f"{settings.API_V1_STR}/login/client-token", data=form)
+    assert r.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def _login(client: TestClient, email: str, password: str) -> dict[str, str]:
+    r = client.post(
+        f"{settings.API_V1_STR}/login/access-token", data={"username": email, "password": password}
+    )
+    assert r.status_code == HTTPStatus.OK
+    return r.json()
+
+
+def _refresh(client: TestClient, refresh_token: str):
+    return client.post(f"{settings.API_V1_STR}/login/refresh-token", data={"refresh_token": refresh_token})
+
+
+def test_refresh_token_rotation(client: TestClient, db: Session) -> None:
+    user, plain_password = UserFactory(session=db)
+    tokens = _login(client, user.email, plain_password)
+    assert tokens["refresh_token"]
+
+    r = _refresh(client, tokens["refresh_token"])
+    assert r.status_code == HTTPStatus.OK
+    rotated = r.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == HTTPStatus.OK
+    assert r.json()["email"] == user.email
+
+    stored = db.exec(select(RefreshToken).where(RefreshToken.user_id == user.id)).all()
+    assert len(stored) == 2
+    assert all(row.token_hash not in (tokens["refresh_token"], rotated["refresh_token"]) for row in stored)
+
+
+def test_refresh_token_reuse_revokes_family(client: TestClient, db: Session) -> None:
+    user, plain_password = UserFactory(session=db)
+    tokens = _login(client, user.email, plain_password)
+    rotated = _refresh(client, tokens["refresh_token"]).json()
+
+    r = _refresh(client, tokens["refresh_token"])
+    assert r.status_code == HTTPStatus.UNAUTHORIZED
+    assert r.json()["detail"] == "Invalid refresh token"
+    # The legitimate successor was revoked along with the reused token
+    assert _refresh(client, rotated["refresh_token"]).status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_refresh_token_invalidated_by_token_version_bump(client: TestClient, db: Session) -> None:
+    user, plain_password = UserFactory(session=db)
+    tokens = _login(client, user.email, plain_password)
+    UserService(db).revoke_tokens(user.id)
+    assert _refresh(client, tokens["refresh_token"]).status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_logout_revokes_access_token(client: TestClient, db: Session) -> None:
+    user, plain_password = UserFactory(session=db)
+    tokens = _login(client, user.email, plain_password)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    r = client.post(f"{settings.API_V1_STR}/logout", headers=headers)
+    assert r.status_code == HTTPStatus.OK
+    assert r.json() == {"message": "Logged out successfully"}
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == HTTPStatus.FORBIDDEN
+    assert r.json()["detail"] == "Token has been revoked"
+
+
+def test_login_rate_limited_per_email(client: TestClient, db: Session, monkeypatch) -> None:
+    monkeypatch.setitem(login_rate_limiter.limits, "email", 2)
+    login_data = {"username": "Throttled@Example.com", "password": "wrongpassword"}
+    for _ in range(2):
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+        assert r.status_code == HTTPStatus.BAD_REQUEST
+
+    with patch.object(UserService, "authenticate") as mock_authenticate:
+        r = client.post(
+            f"{settings.API_V1_STR}/login/access-token",
+            data={**login_data, "username": "throttled@example.com"},
+        )
+    assert r.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert r.json()["detail"] == "Too many requests"
+    assert 1 <= int(r.headers["Retry-After"]) <= settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+    mock_authenticate.assert_not_called()
+
+
+def test_login_rate_limited_per_ip(client: TestClient, db: Session, monkeypatch) -> None:
+    monkeypatch.setitem(login_rate_limiter.limits, "ip", 3)
+    for i in range(3):
+        login_data = {"username": f"user{i}@example.com", "password": "wrongpassword"}
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+        assert r.status_code == HTTPStatus.BAD_REQUEST
+    login_data = {"username": "another@example.com", "password": "wrongpassword"}
+    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+def test_login_shed_when_hashing_saturated(
+    client: TestClient, db: Session, superuser_token_headers: dict[str, str], monkeypatch
+) -> None:
+    # No free hashing slots and no room to queue
+    monkeypatch.setattr(password_hash_gate, "max_concurrency", 0)
+    monkeypatch.setattr(password_hash_gate, "max_queue", 0)
+    monkeypatch.setattr(password_hash_gate, "_semaphore", None)
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert int(r.headers["Retry-After"]) >= 1
+
+    # Routes that do not hash passwords are unaffected
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == HTTPStatus.OK
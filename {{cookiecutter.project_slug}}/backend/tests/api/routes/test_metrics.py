@@ -0,0 +1,16 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_read_metrics(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    r = client.get(f"{settings.API_V1_STR}/metrics/", headers=superuser_token_headers)
+    assert r.status_code == status.HTTP_200_OK
+    metrics = r.json()
+    # The request itself was authenticated through the token cache
+    assert metrics["token_cache"]["hits"] + metrics["token_cache"]["misses"] >= 1
+    gate = metrics["password_hash_gate"]
+    assert gate["admitted"] >= 1
+    assert {"queue_depth", "in_flight", "wait_seconds_avg", "wait_seconds_max"} <= gate.keys()
+
@@ -7,6 +7,7 @@ from sqlmodel import Session
 
 from app.crud import user as crud_user
 from app.core.config import settings
+from app.core.rate_limit import password_reset_rate_limiter
 from app.core.security import get_password_hash, verify_password
 from app.models import User # Nueva importación
 from tests.factories import UserFactory, UserCreateFactory
@@ -91,4 +92,13 @@ def test_reset_password_invalid_or_expired_token(
         },
     )
     assert response.status_code == HTTPStatus.BAD_REQUEST
-    assert response.json() == {"detail": expected_detail}
\ No newline at end of file
+    assert response.json() == {"detail": expected_detail}
+
+def test_request_password_reset_rate_limited(client: TestClient, db: Session, monkeypatch) -> None:
+    monkeypatch.setitem(password_reset_rate_limiter.limits, "email", 1)
+    email = "unknown-user@example.com"
+    r = client.post(f"{settings.API_V1_STR}/password-reset/request-password-reset", params={"email": email})
+    assert r.status_code == HTTPStatus.NOT_FOUND
+    r = client.post(f"{settings.API_V1_STR}/password-reset/request-password-reset", params={"email": email})
+    assert r.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert "Retry-After" in r.headers
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+import jwt
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_read_jwks(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    signing_key = security.load_signing_key("EdDSA", None)
+    monkeypatch.setattr(
+        security, "_key_ring", security.KeyRing(active=signing_key, keys={signing_key.kid: signing_key})
+    )
+
+    r = client.get("/.well-known/jwks.json")
+    assert r.status_code == status.HTTP_200_OK
+    assert r.headers["Cache-Control"] == f"public, max-age={settings.JWKS_CACHE_MAX_AGE_SECONDS}"
+    keys = r.json()["keys"]
+    assert len(keys) == 1
+    assert keys[0]["kid"] == signing_key.kid
+    assert keys[0]["use"] == "sig"
+    assert "d" not in keys[0]
+
+    token = security.create_access_token("subject", expires_delta=timedelta(minutes=5))
+    claims = jwt.decode(token, jwt.PyJWK(keys[0]).key, algorithms=["EdDSA"])
+    assert claims["sub"] == "subject"
@@ -3,14 +3,23 @@ from datetime import timedelta
 from typing import Any, Generator
 
 import pytest
+from unittest.mock import patch
 from fastapi import Depends, FastAPI
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
-from app.api.deps import get_current_active_superuser, get_current_user, get_db
+from app.api.deps import (
+    get_current_active_superuser,
+    get_current_principal,
+    get_current_user,
+    get_db,
+    token_cache,
+)
 from app.core import security
 from app.core.config import settings
-from app.models import User
+from app.core.principal import Principal, principal_cache
+from app.models import User, UserUpdate
+from app.services.user_service import UserService
 from tests.factories import UserFactory
 
 # Create a temporary FastAPI app to test dependencies
@@ -38,6 +47,13 @@ def route_with_superuser(
     return {"user_id": str(current_user.id)}
 
 
+@app.get("/test-current-principal")
+def route_with_principal(
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    return {"user_id": str(current_user.id)}
+
+
 client = TestClient(app)
 
 
@@ -108,3 +124,92 @@ def test_get_current_active_superuser_success(db: Session) -> None:
     assert response.status_code == 200
     assert response.json() == {"user_id": str(user.id)}
 
+
+def test_get_current_user_reuses_verified_token(db: Session) -> None:
+    """Test that a repeated token is served from the token cache."""
+    app.dependency_overrides[get_db] = lambda: db
+    user, _ = UserFactory(session=db)
+
+    expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = security.create_access_token(user.id, expires_delta=expires_delta)
+    headers = {"Authorization": f"Bearer {token}"}
+    hits_before = token_cache.stats()["hits"]
+    first = client.get("/test-current-user", headers=headers)
+    second = client.get("/test-current-user", headers=headers)
+    app.dependency_overrides = {}
+    assert first.status_code == second.status_code == 200
+    assert second.json() == {"user_id": str(user.id)}
+    assert token_cache.stats()["hits"] == hits_before + 1
+
+
+def test_get_current_principal_served_from_cache(db: Session) -> None:
+    """Test that a cached principal is used without loading the user again."""
+    app.dependency_overrides[get_db] = lambda: db
+    user, _ = UserFactory(session=db)
+
+    expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = security.create_access_token(user.id, expires_delta=expires_delta)
+    headers = {"Authorization": f"Bearer {token}"}
+    first = client.get("/test-current-principal", headers=headers)
+    assert principal_cache.get(str(user.id)) == Principal.from_user(user)
+    hits_before = principal_cache.stats()["hits"]
+    second = client.get("/test-current-principal", headers=headers)
+    app.dependency_overrides = {}
+    assert first.status_code == second.status_code == 200
+    assert second.json() == {"user_id": str(user.id)}
+    assert principal_cache.stats()["hits"] == hits_before + 1
+
+
+def test_get_current_principal_invalidated_on_deactivation(db: Session) -> None:
+    """Test that deactivating a user takes effect despite a cached principal."""
+    app.dependency_overrides[get_db] = lambda: db
+    user, _ = UserFactory(session=db)
+
+    expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = security.create_access_token(user.id, expires_delta=expires_delta)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/test-current-principal", headers=headers).status_code == 200
+
+    UserService(db).update_user(user_id=user.id, user_in=UserUpdate(is_active=False))
+    response = client.get("/test-current-principal", headers=headers)
+    app.dependency_overrides = {}
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Inactive user"}
+
+
+def _claims_token(user: User) -> str:
+    expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    with patch.object(settings, "ACCESS_TOKEN_CLAIMS", True):
+        claims = security.get_access_token_claims(user)
+    return security.create_access_token(user.id, expires_delta=expires_delta, claims=claims)
+
+
+def test_claims_token_rejects_normal_user_for_superuser_route(db: Session) -> None:
+    """Test that a self-contained token of a normal user is rejected from its claims."""
+    app.dependency_overrides[get_db] = lambda: db
+    user, _ = UserFactory(session=db, is_superuser=False)
+    headers = {"Authorization": f"Bearer {_claims_token(user)}"}
+    response = client.get("/test-superuser", headers=headers)
+    app.dependency_overrides = {}
+    assert response.status_code == 403
+    assert response.json() == {"detail": "The user doesn't have enough privileges"}
+    assert principal_cache.get(str(user.id)) is None
+
+
+def test_claims_token_revoked_by_token_version_bump(db: Session) -> None:
+    """Test that bumping token_version revokes previously issued tokens."""
+    app.dependency_overrides[get_db] = lambda: db
+    user, _ = UserFactory(session=db, is_superuser=True)
+    headers = {"Authorization": f"Bearer {_claims_token(user)}"}
+    assert client.get("/test-superuser", headers=headers).status_code == 200
+
+    UserService(db).revoke_tokens(user.id)
+    response = client.get("/test-superuser", headers=headers)
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Token has been revoked"}
+
+    db.refresh(user)
+    fresh_headers = {"Authorization": f"Bearer {_claims_token(user)}"}
+    response = client.get("/test-current-user", headers=fresh_headers)
+    app.dependency_overrides = {}
+    assert response.status_code == 200
@@ -9,6 +9,7 @@ from app.crud import client as crud_client
 from app.api.deps import get_db
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.rate_limit import rate_limit_backend
 from app.main import app
 from app.core.security import get_password_hash, verify_password
 from app.models import UserCreate, Client, ClientCreate, User
@@ -22,6 +23,12 @@ def setup_db():
     SQLModel.metadata.drop_all(engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    # Every test logs in from the same client, so start each one with fresh counters
+    rate_limit_backend.reset()
+
+
 @pytest.fixture(scope="function")
 def db() -> Generator[Session, None, None]:
     connection = engine.connect()
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionGate, OverloadedError
+
+
+def test_admission_gate_sheds_beyond_queue() -> None:
+    gate = AdmissionGate("test", max_concurrency=1, max_queue=1, max_wait=5)
+
+    async def work(release: asyncio.Event) -> None:
+        async with gate.admit():
+            await release.wait()
+
+    async def run() -> None:
+        release = asyncio.Event()
+        running = asyncio.create_task(work(release))
+        queued = asyncio.create_task(work(release))
+        await asyncio.sleep(0)
+        assert gate.in_flight == 1
+        assert gate.queue_depth == 1
+
+        with pytest.raises(OverloadedError) as exc_info:
+            async with gate.admit():
+                pass
+        assert exc_info.value.retry_after >= 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(run())
+    stats = gate.stats()
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == 1
+    assert stats["max_queue_depth"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+def test_admission_gate_times_out_waiters() -> None:
+    gate = AdmissionGate("test", max_concurrency=1, max_queue=10, max_wait=0.01)
+
+    async def run() -> None:
+        async with gate.admit():
+            with pytest.raises(OverloadedError):
+                async with gate.admit():
+                    pass
+
+    asyncio.run(run())
+    assert gate.timed_out == 1
+    assert gate.queue_depth == 0
@@ -0,0 +1,42 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_cache_hit_and_miss_counters() -> None:
+    cache = TTLCache(maxsize=10)
+    assert cache.get("missing") is None
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_entry_expires_at_deadline() -> None:
+    cache = TTLCache(maxsize=10)
+    cache.set("expired", "value", expires_at=time.time() - 1)
+    cache.set("fresh", "value", expires_at=time.time() + 60)
+    assert cache.get("expired") is None
+    assert cache.get("fresh") == "value"
+    assert len(cache) == 1
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_invalidate_and_disabled() -> None:
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("key", "value")
+    cache.invalidate("key")
+    assert cache.get("key") is None
+
+    disabled = TTLCache(maxsize=0)
+    disabled.set("key", "value")
+    assert disabled.get("key") is None
@@ -0,0 +1,16 @@
+from sqlalchemy import inspect, text
+from sqlmodel import Session
+
+from app.core.db import upgrade_schema
+
+
+def test_upgrade_schema_adds_missing_columns(db: Session) -> None:
+    connection = db.connection()
+    connection.execute(text("ALTER TABLE users DROP COLUMN token_version"))
+    assert "token_version" not in {column["name"] for column in inspect(connection).get_columns("users")}
+
+    upgrade_schema(connection)
+
+    assert "token_version" in {column["name"] for column in inspect(connection).get_columns("users")}
+    # Running it again is a no-op
+    upgrade_schema(connection)
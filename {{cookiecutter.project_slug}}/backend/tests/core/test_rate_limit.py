@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from app.core.rate_limit import InMemoryRateLimitBackend, RateLimiter
+
+
+def test_sliding_window_counts_previous_window() -> None:
+    backend = InMemoryRateLimitBackend()
+    with patch("app.core.rate_limit.time.time", return_value=1000.0):
+        for _ in range(10):
+            assert backend.hit("key", limit=10, window=60) is None
+        assert backend.hit("key", limit=10, window=60) is not None
+
+    # Halfway through the next window half of the previous hits still count
+    with patch("app.core.rate_limit.time.time", return_value=1050.0):
+        assert backend.hit("key", limit=10, window=60) is None
+    with patch("app.core.rate_limit.time.time", return_value=1050.0):
+        hits = [backend.hit("key", limit=10, window=60) for _ in range(10)]
+    assert hits.count(None) < 10
+    assert hits[-1] is not None
+
+
+def test_rate_limiter_checks_every_key() -> None:
+    limiter = RateLimiter("test", InMemoryRateLimitBackend(), limits={"ip": 100, "email": 1}, window=60)
+    assert limiter.hit(ip="127.0.0.1", email="a@example.com") is None
+    assert limiter.hit(ip="127.0.0.1", email="b@example.com") is None
+    retry_after = limiter.hit(ip="127.0.0.1", email="a@example.com")
+    assert retry_after is not None and 1 <= retry_after <= 60
@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.revocation import BloomFilter, RevocationList
+from app.crud import revoked_token as crud_revoked_token
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    items = [uuid.uuid4().hex for _ in range(1000)]
+    for item in items:
+        bloom_filter.add(item)
+    assert all(item in bloom_filter for item in items)
+    assert bloom_filter.count == 1000
+    assert 0.005 < bloom_filter.false_positive_rate < 0.02
+
+
+def test_bloom_filter_false_positive_rate_is_bounded() -> None:
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    for _ in range(1000):
+        bloom_filter.add(uuid.uuid4().hex)
+    false_positives = sum(uuid.uuid4().hex in bloom_filter for _ in range(10_000))
+    assert false_positives < 300
+
+
+def test_revocation_list_revoke_and_check(db: Session) -> None:
+    revocation_list = RevocationList(capacity=1000, false_positive_rate=0.001, sync_seconds=60)
+    jti = uuid.uuid4().hex
+    assert not revocation_list.is_revoked(db, jti)
+
+    revocation_list.revoke(db, jti, datetime.now(timezone.utc) + timedelta(minutes=5))
+    assert revocation_list.is_revoked(db, jti)
+    stats = revocation_list.stats()
+    assert stats["items"] >= 1
+    assert stats["size_bytes"] > 0
+    assert stats["store_lookups"] == 1
+
+
+def test_revocation_list_picks_up_other_workers_on_sync(db: Session) -> None:
+    revocation_list = RevocationList(capacity=1000, false_positive_rate=0.001, sync_seconds=60)
+    revocation_list.sync(db)
+    jti = uuid.uuid4().hex
+    crud_revoked_token.create_revoked_token(
+        session=db, jti=jti, expires_at=datetime.now(timezone.utc) + timedelta(minutes=5)
+    )
+    assert not revocation_list.is_revoked(db, jti)
+
+    revocation_list.sync(db)
+    assert revocation_list.is_revoked(db, jti)
+
+
+def test_revocation_list_skips_expired_tokens(db: Session) -> None:
+    revocation_list = RevocationList(capacity=1000, false_positive_rate=0.001, sync_seconds=60)
+    jti = uuid.uuid4().hex
+    crud_revoked_token.create_revoked_token(
+        session=db, jti=jti, expires_at=datetime.now(timezone.utc) - timedelta(minutes=5)
+    )
+    revocation_list.sync(db, full=True)
+    assert jti not in revocation_list.filter
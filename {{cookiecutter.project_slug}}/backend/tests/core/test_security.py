@@ -0,0 +1,152 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from cryptography.hazmat.primitives import serialization
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_password_hash_async_round_trip() -> None:
+    """
+    Test hashing and verifying a password through the hashing pool.
+    """
+    async def round_trip() -> tuple[bool, bool]:
+        hashed_password = await security.get_password_hash_async("supersecret")
+        valid = await security.verify_password_async("supersecret", hashed_password)
+        invalid = await security.verify_password_async("wrongsecret", hashed_password)
+        return valid, invalid
+
+    try:
+        valid, invalid = asyncio.run(round_trip())
+    finally:
+        security.shutdown_hash_executor()
+    assert valid
+    assert not invalid
+
+
+def test_hash_async_matches_sync_verification() -> None:
+    """
+    Test that hashes produced in the pool verify with the synchronous API.
+    """
+    try:
+        hashed_password = asyncio.run(security.get_password_hash_async("supersecret"))
+    finally:
+        security.shutdown_hash_executor()
+    assert security.verify_password("supersecret", hashed_password)
+
+
+def test_client_secret_hmac_scheme() -> None:
+    """
+    Test that client secrets are hashed with the prefixed HMAC scheme.
+    """
+    hashed_secret = security.get_client_secret_hash("client-secret")
+    assert hashed_secret.startswith(f"{security.CLIENT_SECRET_SCHEME}$")
+    assert security.verify_client_secret("client-secret", hashed_secret)
+    assert not security.verify_client_secret("other-secret", hashed_secret)
+    assert not security.client_secret_needs_update(hashed_secret)
+
+
+def test_client_secret_legacy_bcrypt_hash() -> None:
+    """
+    Test that bcrypt hashed client secrets still verify and are flagged for upgrade.
+    """
+    hashed_secret = security.pwd_context.hash("client-secret")
+    assert security.verify_client_secret("client-secret", hashed_secret)
+    assert security.client_secret_needs_update(hashed_secret)
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+def test_asymmetric_token_verifies_with_published_jwk(
+    monkeypatch: pytest.MonkeyPatch, algorithm: str
+) -> None:
+    """
+    Test that tokens signed with an asymmetric key verify with the JWKS entry named by their kid.
+    """
+    signing_key = security.load_signing_key(algorithm, None)
+    monkeypatch.setattr(
+        security, "_key_ring", security.KeyRing(active=signing_key, keys={signing_key.kid: signing_key})
+    )
+
+    token = security.create_access_token("subject", timedelta(minutes=5))
+    header = jwt.get_unverified_header(token)
+    assert header["kid"] == signing_key.kid
+    assert header["alg"] == algorithm
+
+    jwks = security.get_jwks()
+    assert [key["kid"] for key in jwks["keys"]] == [signing_key.kid]
+    public_key = jwt.PyJWK(jwks["keys"][0])
+    claims = jwt.decode(token, public_key.key, algorithms=[algorithm])
+    assert claims["sub"] == "subject"
+    assert security.decode_access_token(token)["sub"] == "subject"
+
+
+def test_token_with_unknown_kid_is_rejected() -> None:
+    """
+    Test that a token naming a key we do not hold is rejected.
+    """
+    other_key = security.load_signing_key("HS256", "another-secret")
+    token = jwt.encode(
+        {"sub": "subject"}, other_key.signing_key, algorithm="HS256", headers={"kid": other_key.kid}
+    )
+    with pytest.raises(jwt.InvalidTokenError):
+        security.decode_access_token(token)
+
+
+def test_hs256_keys_are_not_published() -> None:
+    """
+    Test that shared secrets never appear in the JWKS.
+    """
+    assert security.get_signing_key().algorithm == "HS256"
+    assert security.get_jwks() == {"keys": []}
+
+
+def test_key_ring_rotation(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    """
+    Test that tokens signed with a retired key still verify after rotation,
+    while new tokens are signed with the active key.
+    """
+    old_key = security.load_signing_key("EdDSA", None)
+    old_pem = old_key.signing_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    key_ring_file = tmp_path / "keys.json"
+    key_ring_file.write_text(json.dumps({
+        "active": "2026-01",
+        "keys": [{"kid": "2026-01", "algorithm": "EdDSA", "key": old_pem}],
+    }))
+    monkeypatch.setattr(settings, "JWT_KEY_RING_FILE", str(key_ring_file))
+    monkeypatch.setattr(security, "_key_ring", None)
+    old_token = security.create_access_token("subject", timedelta(minutes=5))
+    assert jwt.get_unverified_header(old_token)["kid"] == "2026-01"
+
+    # Rotate: a new active HS256 key, the old key kept for verification only
+    key_ring_file.write_text(json.dumps({
+        "active": "2026-02",
+        "keys": [
+            {"kid": "2026-02", "algorithm": "HS256", "key": "rotated-secret"},
+            {"kid": "2026-01", "algorithm": "EdDSA", "public_key": old_key.verification_key.public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+            ).decode()},
+        ],
+    }))
+    security.reload_key_ring()
+    new_token = security.create_access_token("subject", timedelta(minutes=5))
+    assert jwt.get_unverified_header(new_token)["kid"] == "2026-02"
+    assert security.decode_access_token(old_token)["sub"] == "subject"
+    assert security.decode_access_token(new_token)["sub"] == "subject"
+    assert [key["kid"] for key in security.get_jwks()["keys"]] == ["2026-01"]
+
+
+def test_key_ring_requires_signing_active_key() -> None:
+    """
+    Test that a key ring whose active key cannot sign is rejected.
+    """
+    with pytest.raises(ValueError):
+        security.load_key_ring({"active": "missing", "keys": [
+            {"kid": "present", "algorithm": "HS256", "key": "secret"},
+        ]})